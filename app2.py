@@ -1,8 +1,28 @@
 import streamlit as st
 import requests
-import tempfile
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
-import json
+from pathlib import Path
+import orjson
+
+API_BASE_URL = "http://localhost:8000"
+
+# Rough size of a complete AI response, used to scale the progress bar
+EXPECTED_RESPONSE_CHARS = 1500
+
+@st.cache_resource
+def get_api_session():
+    """Create a pooled HTTP session reused across Streamlit reruns."""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    ))
+    return session
+
+SESSION = get_api_session()
 
 st.title("Resume Information Extractor")
 
@@ -35,43 +55,62 @@ def save_resume_json(form_data):
         # Full path for the JSON file
         file_path = os.path.join(resume_dir, filename)
         
-        # Save the JSON file
-        with open(file_path, 'w') as f:
-            json.dump(form_data, f, indent=4)
+        # Save the JSON file in a single write
+        Path(file_path).write_bytes(orjson.dumps(form_data, option=orjson.OPT_INDENT_2))
         
         return file_path
     except Exception as e:
         st.error(f"Error saving JSON: {e}")
         return None
 
+def read_extraction_stream(response):
+    """
+    Consume newline-delimited JSON events from the streaming extraction API,
+    updating a progress bar until the final result arrives.
+    """
+    progress_bar = st.progress(0.0, text="Extracting information...")
+    try:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = orjson.loads(line)
+            if event["event"] == "progress":
+                progress_bar.progress(
+                    min(event["chars"] / EXPECTED_RESPONSE_CHARS, 0.99),
+                    text=f"Extracting information... ({event['chars']} characters received)"
+                )
+            elif event["event"] == "result":
+                return event["data"]
+            else:
+                raise RuntimeError(event.get("detail", "Unknown extraction error"))
+        raise RuntimeError("Extraction stream ended without a result")
+    finally:
+        # Return the streamed connection to the session pool
+        response.close()
+        progress_bar.empty()
+
 # File upload section
-st.subheader("Upload Resume")
-uploaded_file = st.file_uploader("Choose a PDF or DOCX file", 
-                                 type=['pdf', 'docx'], 
-                                 help="Upload your resume in PDF or DOCX format")
+with st.form("extract_form"):
+    st.subheader("Upload Resume")
+    uploaded_file = st.file_uploader("Choose a PDF or DOCX file", 
+                                     type=['pdf', 'docx'], 
+                                     help="Upload your resume in PDF or DOCX format")
+    extract_submitted = st.form_submit_button("Extract Information")
 
-if st.button("Extract Information") and uploaded_file:
+if extract_submitted and uploaded_file:
     try:
-        # Save uploaded file to a temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as temp_file:
-            temp_file.write(uploaded_file.getvalue())
-            temp_file_path = temp_file.name
-        
-        # Open the file in read-binary mode to upload
-        with open(temp_file_path, 'rb') as file:
-            files = {'file': (uploaded_file.name, file, 'multipart/form-data')}
-            
-            # Call extract-resume-file API
-            response = requests.post(
-                "http://localhost:8000/extract-resume-file/", 
-                files=files
-            )
+        # Upload the in-memory file contents directly, no temp file needed
+        files = {'file': (uploaded_file.name, uploaded_file.getvalue(), 'application/octet-stream')}
         
-        # Remove the temporary file
-        os.unlink(temp_file_path)
+        # Call streaming extract-resume-file API
+        response = SESSION.post(
+            f"{API_BASE_URL}/extract-resume-file-stream/", 
+            files=files,
+            stream=True
+        )
         
         if response.status_code == 200:
-            data = response.json()
+            data = read_extraction_stream(response)
             
             # Store extraction data in session state
             st.session_state.extraction_data = data
@@ -100,6 +139,7 @@ if st.button("Extract Information") and uploaded_file:
                 st.button("Reject Extraction Results", on_click=lambda: confirm_extraction(False))
         else:
             st.error(f"Error processing resume: {response.text}")
+            response.close()
     
     except Exception as e:
         st.error(f"Error: {str(e)}")
@@ -199,8 +239,8 @@ with st.form("candidate_form"):
             }
             
             if st.session_state.extraction_id:
-                response = requests.post(
-                    "http://localhost:8000/save-full-json/",
+                response = SESSION.post(
+                    f"{API_BASE_URL}/save-full-json/",
                     json={
                         "extraction_id": st.session_state.extraction_id, 
                         "first_name": first_name,
@@ -1,21 +1,41 @@
-import json
+import orjson
 import os
 import uuid
+import time
+import asyncio
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from cachetools import TTLCache
 import requests
+from requests.adapters import HTTPAdapter
 import re
+import zipfile
 import fitz  # pymupdf
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 from fastapi import FastAPI, HTTPException, File, UploadFile
 from pydantic import BaseModel
-from tempfile import gettempdir
+from tempfile import gettempdir, mkstemp
 import ollama
-from docx import Document
-from fastapi.responses import JSONResponse
+from lxml import etree
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the stale-upload janitor for the lifetime of the app."""
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    janitor = asyncio.create_task(_upload_janitor())
+    try:
+        yield
+    finally:
+        janitor.cancel()
+
 # FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -29,8 +49,97 @@ app.add_middleware(
 # Use system's temp directory
 TEMP_DIR = gettempdir()
 
-# Store extracted data temporarily
-extraction_data_storage = {}
+# Uploads are staged in their own subdirectory so stale files can be swept safely
+UPLOAD_DIR = os.path.join(TEMP_DIR, "resume_uploads")
+UPLOAD_PREFIX = "resume_"
+UPLOAD_SWEEP_INTERVAL = 600  # seconds
+UPLOAD_MAX_AGE = 3600  # seconds
+
+# Chunk size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 16  # 64 KB
+
+# PyMuPDF does not support multithreaded use, and extraction runs in worker threads
+_fitz_lock = threading.Lock()
+
+# Markdown code fences the model sometimes wraps around its JSON output
+_JSON_FENCE_RE = re.compile(r'^```json\s*|\s*```$', re.MULTILINE)
+
+# WordprocessingML tags used when streaming text out of word/document.xml
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_BODY, _W_P, _W_TBL = _W_NS + "body", _W_NS + "p", _W_NS + "tbl"
+_W_R, _W_HYPERLINK = _W_NS + "r", _W_NS + "hyperlink"
+_W_T, _W_BR, _W_BR_TYPE = _W_NS + "t", _W_NS + "br", _W_NS + "type"
+# Fixed text equivalents of run content, matching python-docx's Run.text
+_W_RUN_CHARS = {
+    _W_NS + "tab": "\t",
+    _W_NS + "ptab": "\t",
+    _W_NS + "cr": "\n",
+    _W_NS + "noBreakHyphen": "-",
+}
+
+# Fields scored by calculate_extraction_accuracy, with their key paths split once
+_EXPECTED_FIELD_PATHS = tuple((field, tuple(field.split('.'))) for field in (
+    "full_name", 
+    "current_designation", 
+    "contact_info.email", 
+    "contact_info.phone", 
+    "contact_info.linkedin_url",
+    "address", 
+    "skills.primary_skills", 
+    "skills.secondary_skills", 
+    "total_experience.years", 
+    "education"
+))
+_TOTAL_EXPECTED_FIELDS = len(_EXPECTED_FIELD_PATHS)
+
+# Shared HTTP session so repeated downloads reuse keep-alive connections
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+# Local model built from ./Modelfile (Q4_K_M weights): ollama create resume-extractor -f Modelfile
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "resume-extractor")
+
+# Static extraction instructions sent as the system prompt on every request
+_SCHEMA_INSTRUCTIONS = '''Extract the following information from the resume in **precise JSON format**:
+- **Primary skills MUST be directly related to current designation**
+- **Secondary skills are additional technical/professional skills**
+- **Current designation should be the most recent job title**
+- **Skills should be split into primary (role-specific) and secondary**
+
+Required JSON Structure:
+{
+  "current_designation": "string",
+  "skills": {
+    "primary_skills": ["string (must relate to current designation)"],
+    "secondary_skills": ["string (other skills)"]
+  },
+  "education": [{"institution": "string", "degree": "string"}],
+  "total_experience": {"years": "string"},
+  "full_name": "string",
+  "contact_info": {
+    "email": "string",
+    "phone": ["string"],
+    "linkedin_url": "string"
+  },
+  "address": {
+    "city": "string",
+    "state": "string",
+    "country": "string"
+  }
+}
+'''
+
+# Parsed AI results keyed by sha256 of the resume text (LRU, shared across requests)
+AI_CACHE_MAXSIZE = 256
+_ai_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_ai_cache_lock = threading.Lock()
+
+# Store extracted data temporarily; unconfirmed extractions expire instead of piling up
+EXTRACTION_STORAGE_MAXSIZE = 2048
+EXTRACTION_STORAGE_TTL = 3600  # seconds
+extraction_data_storage = TTLCache(maxsize=EXTRACTION_STORAGE_MAXSIZE, ttl=EXTRACTION_STORAGE_TTL)
+_extraction_storage_lock = threading.Lock()
 
 class ConfirmationRequest(BaseModel):
     extraction_id: str
@@ -41,19 +150,18 @@ class SaveFullJsonRequest(BaseModel):
     first_name: str
     last_name: str
 
-def safe_get(data, *keys, default=None):
-    """Safely retrieve nested values from a dictionary."""
-    for key in keys:
-        if isinstance(data, dict) and key in data:
-            data = data[key]
-        else:
-            return default
-    return data if data is not None else default
+def dedupe_skills(skills) -> List[str]:
+    """Remove duplicate skills ignoring case and surrounding whitespace, keeping first-seen order."""
+    unique = {}
+    for skill in skills or []:
+        if isinstance(skill, str) and (skill := skill.strip()):
+            unique.setdefault(skill.lower(), skill)
+    return list(unique.values())
 
 def download_file(file_url: str, save_path: str) -> bool:
     """Download a file from a URL and save it locally."""
     try:
-        response = requests.get(file_url, stream=True)
+        response = HTTP_SESSION.get(file_url, stream=True)
         response.raise_for_status()
         with open(save_path, "wb") as file:
             for chunk in response.iter_content(chunk_size=8192):
@@ -66,123 +174,159 @@ def download_file(file_url: str, save_path: str) -> bool:
 def extract_text_from_pdf(pdf_path: str) -> str:
     """Extract text from PDF using pymupdf4llm (pymupdf)."""
     try:
-        doc = fitz.open(pdf_path)  # Open PDF
-        text = "\n".join([page.get_text("text") for page in doc])  # Extract text from pages
+        with _fitz_lock, fitz.open(pdf_path) as doc:  # Open PDF
+            text = "\n".join(page.get_text("text") for page in doc)  # Extract text from pages
         return text.strip()
     except Exception as e:
         raise RuntimeError(f"PDF text extraction failed: {str(e)}")
 
+def _docx_run_text(run) -> str:
+    """Text of a w:r element, read from its direct children as python-docx does."""
+    parts = []
+    for node in run:
+        if node.tag == _W_T:
+            parts.append(node.text or "")
+        elif node.tag == _W_BR:
+            # Line breaks become newlines; page and column breaks add nothing
+            parts.append("\n" if node.get(_W_BR_TYPE, "textWrapping") == "textWrapping" else "")
+        else:
+            parts.append(_W_RUN_CHARS.get(node.tag, ""))
+    return "".join(parts)
+
+def _docx_paragraph_text(para) -> str:
+    """
+    Text of a w:p element from its own runs and hyperlink runs only, so nested
+    content such as text boxes (written twice, under mc:Choice and mc:Fallback)
+    is not pulled in.
+    """
+    parts = []
+    for child in para:
+        if child.tag == _W_R:
+            parts.append(_docx_run_text(child))
+        elif child.tag == _W_HYPERLINK:
+            parts.extend(_docx_run_text(run) for run in child if run.tag == _W_R)
+    return "".join(parts)
+
 def extract_text_from_docx(docx_path: str) -> str:
     """Extract text from a DOCX file."""
     try:
-        doc = Document(docx_path)
-        return "\n".join([para.text for para in doc.paragraphs])
+        paragraphs = []
+        with zipfile.ZipFile(docx_path) as docx_zip, docx_zip.open("word/document.xml") as stream:
+            # Stream paragraphs instead of building the full python-docx object tree.
+            # Like python-docx's doc.paragraphs, only paragraphs directly under w:body
+            # are kept; tables are cleared once parsed without contributing text.
+            for _, element in etree.iterparse(stream, events=("end",), tag=(_W_P, _W_TBL)):
+                if element.getparent().tag != _W_BODY:
+                    continue
+                if element.tag == _W_TBL:
+                    element.clear()
+                    continue
+                paragraphs.append(_docx_paragraph_text(element))
+                element.clear()
+        return "\n".join(paragraphs)
     except Exception as e:
         raise RuntimeError(f"DOCX text extraction failed: {str(e)}")
 
-def format_resume_prompt(resume_text: str) -> str:
-    prompt = f'''Extract the following information from the resume in **precise JSON format**:
-- **Primary skills MUST be directly related to current designation**
-- **Secondary skills are additional technical/professional skills**
-- **Current designation should be the most recent job title**
-- **Skills should be split into primary (role-specific) and secondary**
+def build_resume_messages(resume_text: str) -> List[Dict[str, str]]:
+    """
+    Build chat messages for extraction. The schema instructions are a constant
+    system message so the model server can reuse its cached prompt prefix.
+    """
+    return [
+        {'role': 'system', 'content': _SCHEMA_INSTRUCTIONS},
+        {'role': 'user', 'content': f"Resume Text:\n{resume_text}\n"}
+    ]
 
-Required JSON Structure:
-{{
-  "current_designation": "string",
-  "skills": {{
-    "primary_skills": ["string (must relate to current designation)"],
-    "secondary_skills": ["string (other skills)"]
-  }},
-  "education": [{{"institution": "string", "degree": "string"}}],
-  "total_experience": {{"years": "string"}},
-  "full_name": "string",
-  "contact_info": {{
-    "email": "string",
-    "phone": ["string"],
-    "linkedin_url": "string"
-  }},
-  "address": {{
-    "city": "string",
-    "state": "string",
-    "country": "string"
-  }}
-}}
+def _ai_cache_get(text_hash: str) -> Optional[Dict[str, Any]]:
+    """Return the cached AI result for a resume hash, if any."""
+    with _ai_cache_lock:
+        data = _ai_cache.get(text_hash)
+        if data is not None:
+            _ai_cache.move_to_end(text_hash)
+        return data
 
-Resume Text:
-{resume_text}
-'''
-    return prompt
+def _ai_cache_put(text_hash: str, data: Dict[str, Any]) -> None:
+    """Store an AI result, evicting the least recently used entry when full."""
+    with _ai_cache_lock:
+        _ai_cache[text_hash] = data
+        _ai_cache.move_to_end(text_hash)
+        if len(_ai_cache) > AI_CACHE_MAXSIZE:
+            _ai_cache.popitem(last=False)
 
-def process_with_ai(resume_text: str) -> Dict[str, Any]:
-    """Get structured data from AI model."""
-    try:
-        response = ollama.chat(
-            model='qwen2.5:0.5b',
-            messages=[{'role': 'user', 'content': format_resume_prompt(resume_text)}],
-            format='json',
-            stream=False
-        )
-        json_str = response['message']['content'].strip()
-        json_str = re.sub(r'^```json\s*|\s*```$', '', json_str, flags=re.MULTILINE)
-        data = json.loads(json_str)
+def parse_ai_output(content: str) -> Dict[str, Any]:
+    """Parse the model's JSON output into a normalized dictionary."""
+    json_str = _JSON_FENCE_RE.sub('', content.strip())
+    data = orjson.loads(json_str)
+
+    if 'education' in data and isinstance(data['education'], dict):
+        data['education'] = [data['education']]
 
-        if 'education' in data and isinstance(data['education'], dict):
-            data['education'] = [data['education']]
+    return data
 
+def iter_process_with_ai(resume_text: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream structured data from AI model.
+    Yields ("progress", characters_received) while the model responds,
+    then a final ("result", data).
+    """
+    try:
+        text_hash = hashlib.sha256(resume_text.encode()).hexdigest()
+        cached = _ai_cache_get(text_hash)
+        if cached is None:
+            content = bytearray()
+            chars_received = 0
+            for chunk in ollama.chat(
+                model=OLLAMA_MODEL,
+                messages=build_resume_messages(resume_text),
+                format='json',
+                stream=True
+            ):
+                piece = chunk['message']['content']
+                content += piece.encode()
+                chars_received += len(piece)
+                yield "progress", chars_received
+            cached = parse_ai_output(content.decode())
+            _ai_cache_put(text_hash, cached)
+
+        # Copy so per-request fields never leak into the cached result
+        data = copy.deepcopy(cached)
         data['extraction_id'] = str(uuid.uuid4())
         data['processing_date'] = datetime.now().isoformat()
 
-        return data
+        yield "result", data
     except Exception as e:
         raise RuntimeError(f"AI processing failed: {str(e)}")
 
+def process_with_ai(resume_text: str) -> Dict[str, Any]:
+    """Get structured data from AI model."""
+    for event, payload in iter_process_with_ai(resume_text):
+        if event == "result":
+            return payload
+    raise RuntimeError("AI processing failed: no result produced")
+
 def calculate_extraction_accuracy(extracted_data: Dict[str, Any]) -> Dict[str, Any]:
     """Calculate extraction accuracy metrics."""
-    expected_fields = [
-        "full_name", 
-        "current_designation", 
-        "contact_info.email", 
-        "contact_info.phone", 
-        "contact_info.linkedin_url",
-        "address", 
-        "skills.primary_skills", 
-        "skills.secondary_skills", 
-        "total_experience.years", 
-        "education"
-    ]
-    
     filled_fields = 0
-    empty_fields = 0
     field_status = {}
     
-    for field in expected_fields:
-        parts = field.split('.')
-        if len(parts) == 1:
-            value = extracted_data.get(parts[0], None)
-        elif len(parts) == 2:
-            parent = extracted_data.get(parts[0], {})
-            value = parent.get(parts[1], None) if isinstance(parent, dict) else None
-        else:
-            value = None
+    for field, path in _EXPECTED_FIELD_PATHS:
+        value = extracted_data
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
             
         # Check if field is empty
         is_empty = (
             value is None or 
             value == "" or 
-            value == [] or 
             value == {} or 
-            (isinstance(value, List) and all(not item for item in value))
+            (isinstance(value, list) and not any(value))
         )
         
         field_status[field] = "empty" if is_empty else "filled"
-        
-        if is_empty:
-            empty_fields += 1
-        else:
-            filled_fields += 1
+        filled_fields += not is_empty
     
-    total_fields = len(expected_fields)
+    total_fields = _TOTAL_EXPECTED_FIELDS
+    empty_fields = total_fields - filled_fields
     
     return {
         "filled_fields": filled_fields,
@@ -192,88 +336,158 @@ def calculate_extraction_accuracy(extracted_data: Dict[str, Any]) -> Dict[str, A
         "field_status": field_status
     }
 
-@app.post("/extract-resume-file/")
-async def extract_resume_from_file(file: UploadFile = File(...)):
-    """Extract resume data from an uploaded PDF or DOCX file."""
+def sweep_stale_uploads(max_age: float = UPLOAD_MAX_AGE) -> int:
+    """Delete uploaded resumes older than max_age seconds left behind in UPLOAD_DIR."""
+    removed = 0
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(UPLOAD_DIR))
+    except FileNotFoundError:
+        return removed
+    for entry in entries:
+        try:
+            if (entry.is_file()
+                    and entry.name.startswith(UPLOAD_PREFIX)
+                    and entry.stat().st_mtime < cutoff):
+                os.remove(entry.path)
+                removed += 1
+        except OSError as e:
+            print(f"Upload cleanup failed for {entry.path}: {e}")
+    return removed
+
+async def _upload_janitor():
+    """Periodically sweep stale uploads that survived a crash or kill."""
+    while True:
+        await asyncio.to_thread(sweep_stale_uploads)
+        await asyncio.sleep(UPLOAD_SWEEP_INTERVAL)
+
+async def read_resume_text(file: UploadFile) -> str:
+    """Save an uploaded PDF or DOCX file to a temp location and extract its text."""
     tmp_file_path = None
     try:
-        # Create temp file with original extension
-        filename = file.filename
-        tmp_file_path = os.path.join(TEMP_DIR, filename)
-
-        # Save uploaded file
-        with open(tmp_file_path, "wb") as buffer:
-            buffer.write(await file.read())
-
-        # Extract text
+        # Create a uniquely named temp file with the original extension, so concurrent
+        # uploads sharing a filename never collide and the client name can't escape UPLOAD_DIR
+        suffix = os.path.splitext(file.filename or "")[1].lower()
+        # Recreate the directory if a tmp cleaner removed it since startup
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        fd, tmp_file_path = mkstemp(dir=UPLOAD_DIR, prefix=UPLOAD_PREFIX, suffix=suffix)
+
+        # Save uploaded file in chunks so memory stays bounded by the chunk size
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+
+        # Extract text in a worker thread so parsing does not block the event loop
         resume_text = ""
         if tmp_file_path.lower().endswith(".pdf"):
-            resume_text = extract_text_from_pdf(tmp_file_path)
+            resume_text = await asyncio.to_thread(extract_text_from_pdf, tmp_file_path)
         elif tmp_file_path.lower().endswith(".docx"):
-            resume_text = extract_text_from_docx(tmp_file_path)
+            resume_text = await asyncio.to_thread(extract_text_from_docx, tmp_file_path)
         else:
             raise HTTPException(400, "Unsupported file format. Only PDF and DOCX are allowed.")
 
         if not resume_text:
             raise HTTPException(500, "Failed to extract text from resume")
 
-        # Process with AI
-        json_data = process_with_ai(resume_text)
-        extraction_id = json_data["extraction_id"]
+        return resume_text
+    finally:
+        if tmp_file_path and os.path.exists(tmp_file_path):
+            os.remove(tmp_file_path)
+
+def build_extracted_info(json_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Store AI output for later confirmation and shape it into the API response."""
+    extraction_id = json_data["extraction_id"]
+    with _extraction_storage_lock:
         extraction_data_storage[extraction_id] = json_data
-        
-        # Calculate accuracy metrics
-        accuracy_metrics = calculate_extraction_accuracy(json_data)
-
-        # Extract structured data for response (same as previous URL-based implementation)
-        full_name = safe_get(json_data, 'full_name', default='')
-        names = full_name.split() if full_name else [""]
-
-        contact_info = safe_get(json_data, 'contact_info', default={})
-        phone_list = safe_get(contact_info, 'phone', default=[]) or safe_get(json_data, 'phone', default=[])
-        phone_number = phone_list[0] if isinstance(phone_list, list) and phone_list else ""
-        email = safe_get(contact_info, 'email', default="") or safe_get(json_data, 'email', default="")
-        linkedin_url = safe_get(contact_info, 'linkedin_url', default="")
-
-        address_info = safe_get(json_data, 'address', default={})
-        address = ", ".join(filter(None, [
-            safe_get(address_info, 'city', default=''),
-            safe_get(address_info, 'state', default=''),
-            safe_get(address_info, 'country', default='')
-        ]))
-
-        current_designation = safe_get(json_data, 'current_designation', default='')
-
-        skills_data = safe_get(json_data, 'skills', default={})
-        primary_skills = list(set(safe_get(skills_data, 'primary_skills', default=[])))
-        secondary_skills = list(set(safe_get(skills_data, 'secondary_skills', default=[])))
-
-        total_experience = safe_get(json_data, 'total_experience', 'years', default="") or safe_get(json_data, 'total_experience', default="")
-
-        extracted_info = {
-            "first_name": names[0] if len(names) > 0 else "",
-            "last_name": " ".join(names[1:]) if len(names) > 1 else "",
-            "current_designation": current_designation,
-            "mobile_number": phone_number,
-            "email": email,
-            "address": address,
-            "linkedin_url": linkedin_url,
-            "skills": {
-                "primary": primary_skills,
-                "secondary": secondary_skills
-            },
-            "total_experience": total_experience,
-            "education": safe_get(json_data, 'education', default=[]),
-            "extraction_id": extraction_id,
-            "accuracy_metrics": accuracy_metrics
-        }
+    
+    # Calculate accuracy metrics
+    accuracy_metrics = calculate_extraction_accuracy(json_data)
+
+    # Extract structured data for response (same as previous URL-based implementation)
+    # Nested sections are read once; anything that is not a dict is treated as empty
+    get = json_data.get
+    contact_info = get('contact_info')
+    contact_info = contact_info if isinstance(contact_info, dict) else {}
+    address_info = get('address')
+    address_info = address_info if isinstance(address_info, dict) else {}
+    skills_data = get('skills')
+    skills_data = skills_data if isinstance(skills_data, dict) else {}
+    experience = get('total_experience') or ""
+
+    full_name = get('full_name') or ''
+    names = full_name.split() if full_name else [""]
+
+    phone_list = contact_info.get('phone') or get('phone') or []
+    phone_number = phone_list[0] if isinstance(phone_list, list) and phone_list else ""
+    email = contact_info.get('email') or get('email') or ""
+    linkedin_url = contact_info.get('linkedin_url') or ""
 
-        return JSONResponse(content=extracted_info)
+    address = ", ".join(filter(None, [
+        address_info.get('city'),
+        address_info.get('state'),
+        address_info.get('country')
+    ]))
+
+    current_designation = get('current_designation') or ''
+
+    primary_skills = dedupe_skills(skills_data.get('primary_skills'))
+    secondary_skills = dedupe_skills(skills_data.get('secondary_skills'))
+
+    total_experience = (experience.get('years') if isinstance(experience, dict) else None) or experience
+
+    return {
+        "first_name": names[0] if len(names) > 0 else "",
+        "last_name": " ".join(names[1:]) if len(names) > 1 else "",
+        "current_designation": current_designation,
+        "mobile_number": phone_number,
+        "email": email,
+        "address": address,
+        "linkedin_url": linkedin_url,
+        "skills": {
+            "primary": primary_skills,
+            "secondary": secondary_skills
+        },
+        "total_experience": total_experience,
+        "education": get('education') or [],
+        "extraction_id": extraction_id,
+        "accuracy_metrics": accuracy_metrics
+    }
+
+@app.post("/extract-resume-file/")
+async def extract_resume_from_file(file: UploadFile = File(...)):
+    """Extract resume data from an uploaded PDF or DOCX file."""
+    try:
+        resume_text = await read_resume_text(file)
+
+        # Process with AI off the event loop
+        json_data = await asyncio.to_thread(process_with_ai, resume_text)
+
+        return JSONResponse(content=build_extracted_info(json_data))
     except Exception as e:
         raise HTTPException(500, str(e))
-    finally:
-        if tmp_file_path and os.path.exists(tmp_file_path):
-            os.remove(tmp_file_path)
+
+@app.post("/extract-resume-file-stream/")
+async def extract_resume_from_file_stream(file: UploadFile = File(...)):
+    """
+    Extract resume data from an uploaded PDF or DOCX file,
+    streaming AI progress as newline-delimited JSON events.
+    """
+    try:
+        resume_text = await read_resume_text(file)
+    except Exception as e:
+        raise HTTPException(500, str(e))
+
+    def event_stream():
+        try:
+            for event, payload in iter_process_with_ai(resume_text):
+                if event == "progress":
+                    yield orjson.dumps({"event": "progress", "chars": payload}) + b"\n"
+                else:
+                    yield orjson.dumps({"event": "result", "data": build_extracted_info(payload)}) + b"\n"
+        except Exception as e:
+            yield orjson.dumps({"event": "error", "detail": str(e)}) + b"\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
 
 
 
@@ -284,12 +498,11 @@ async def save_full_json(request: SaveFullJsonRequest):
     """
     try:
         # Retrieve the original extraction data
-        if request.extraction_id not in extraction_data_storage:
+        with _extraction_storage_lock:
+            original_data = extraction_data_storage.get(request.extraction_id)
+        if original_data is None:
             raise HTTPException(404, "Extraction data not found")
         
-        # Get the original extracted data
-        original_data = extraction_data_storage[request.extraction_id]
-        
         # Prepare save directory
         save_dir = os.path.join(os.path.dirname(__file__), 'saved_resumes')
         os.makedirs(save_dir, exist_ok=True)
@@ -309,12 +522,27 @@ async def save_full_json(request: SaveFullJsonRequest):
             }
         }
         
-        # Save JSON file
-        with open(filepath, 'w') as f:
-            json.dump(full_save_data, f, indent=4)
+        # Serialize once up front so the file is written with a single call
+        data_bytes = orjson.dumps(full_save_data)
+        
+        # Save JSON file atomically: write a temp file in the same directory, then rename
+        # Exclusive create keeps the name unique and, unlike mkstemp, honours the umask
+        tmp_path = os.path.join(save_dir, f".{uuid.uuid4().hex}.tmp")
+        f = open(tmp_path, 'xb')
+        try:
+            with f:
+                f.write(data_bytes)
+                # Make sure the bytes are on disk before the rename makes them visible
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
         
         # Optional: Clean up the temporary storage
-        del extraction_data_storage[request.extraction_id]
+        with _extraction_storage_lock:
+            extraction_data_storage.pop(request.extraction_id, None)
         
         return {
             "message": "JSON saved successfully",
@@ -326,4 +554,15 @@ async def save_full_json(request: SaveFullJsonRequest):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # Extraction data lives in process memory, so a confirmation must reach the
+    # worker that did the extraction; only raise UVICORN_WORKERS behind sticky routing.
+    uvicorn.run(
+        "main3:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("UVICORN_WORKERS", "1")),
+        # "auto" picks uvloop and httptools when installed (uvicorn[standard]),
+        # and falls back to asyncio/h11 where they are unavailable, e.g. Windows
+        loop="auto",
+        http="auto"
+    )
\ No newline at end of file